@@ -1,15 +1,50 @@
 # FILE: biogas_db/config.py
 # -----------------------------------------------------------------------------
 from pathlib import Path
+from types import MappingProxyType
 import re
 
-EMAIL_RE  = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-PHONE_RE  = re.compile(r"(?:\+?\d[\d\s()/.-]{6,})")
+# Contact patterns. google-re2 compiles them to a linear-time DFA - no
+# backtracking at all on adversarial HTML; the stdlib fallback is safe
+# anyway because the single bounded character-class repetition cannot
+# backtrack catastrophically (no possessive quantifier: that syntax is a
+# re.error before Python 3.11, and this branch is the one without re2).
+try:
+    import re2 as _re2
+    EMAIL_RE = _re2.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+    PHONE_RE = _re2.compile(r"\+?\d[\d\s()/.-]{6,30}")
+except ImportError:
+    EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+    PHONE_RE = re.compile(r"\+?\d[\d\s()/.-]{6,30}")
+
+# Read-only registry of the precompiled patterns. Scrapers should use these
+# compiled objects directly (never re.search with the raw string), so the
+# re module's internal cache can't evict and recompile them.
+PATTERNS = MappingProxyType({"email": EMAIL_RE, "phone": PHONE_RE})
 CHUNKSIZE = 250_000
 MAXROWS_XLSX = 1_000_000
 
+# Stream XLSX rows straight to disk (xlsxwriter constant_memory) instead of
+# buffering whole sheets in RAM - needed for multi-million-row contact dumps
+USE_STREAMING_XLSX = True
+
 SOAP_WSDL = "https://www.marktstammdatenregister.de/MaStRAPI/wsdl/mastr.wsdl"
 
+# Explicit dtypes for the plants CSVs - skips pandas' type sniffing and keeps
+# IDs/postal codes as strings (leading zeros) and numerics narrow
+PLANTS_DTYPES = {
+    "plant_id": "string",
+    "plant_name": "string",
+    "postal_code": "string",
+    "commissioning_year": "Int16",
+    "capacity_el_kW": "float32",
+    "capacity_gas_m3/h": "float32",
+    "operator_id": "string",
+    "latitude": "float32",
+    "longitude": "float32",
+    "plant_type": "category",
+}
+
 # output files (created in cwd)
 OUT_CONTACTS_XLSX = Path("german_biogas_operator_contacts.xlsx")
 OUT_PLANTS_CSV    = Path("german_biogas_plants_2025.csv")
@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 """
-Main pipeline wrapper - executes the main biogas database pipeline
+Main pipeline wrapper - runs the main biogas database pipeline
 """
-import sys
 import os
+import sys
 
-# Change to project root directory
+# Change to project root directory and make its packages importable
 project_root = os.path.dirname(os.path.abspath(__file__))
 os.chdir(project_root)
+sys.path.insert(0, project_root)
+
+# Import instead of exec(): bytecode gets cached in __pycache__ and
+# tracebacks/profilers see the real scripts.main module
+from scripts.main import build_database, parse_args
 
-# Execute the main script directly
-script_path = os.path.join(project_root, 'scripts', 'main.py')
-exec(open(script_path).read())
+if __name__ == "__main__":
+    args = parse_args()
+    build_database(scrape=args.scrape, selenium=args.selenium)
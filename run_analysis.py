@@ -2,13 +2,17 @@
 """
 Analysis runner wrapper - executes enhanced data processing
 """
-import sys
 import os
+import sys
 
-# Change to project root directory
+# Change to project root directory and make its packages importable
 project_root = os.path.dirname(os.path.abspath(__file__))
 os.chdir(project_root)
+sys.path.insert(0, project_root)
+
+# Import instead of exec(): bytecode gets cached in __pycache__ and
+# tracebacks/profilers see the real analysis module
+from src.analysis.enhanced_data_processing import main
 
-# Execute the analysis script directly
-script_path = os.path.join(project_root, 'scripts', 'run_analysis.py')
-exec(open(script_path).read())
+if __name__ == "__main__":
+    main()
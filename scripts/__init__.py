@@ -0,0 +1,2 @@
+# Makes scripts importable as a package so wrappers can use real imports
+# (cached .pyc) instead of exec()ing the source text.
@@ -19,6 +19,24 @@ OUT_CONTACTS_XLSX = DATA_DIR / "german_biogas_operator_contacts.xlsx"
 OUT_PLANTS_CSV = DATA_DIR / "german_biogas_plants_2025.csv"
 OUT_JOIN_CSV = DATA_DIR / "german_biogas_plants_with_contacts.csv"
 
+def write_csv(df, path: Path):
+    """Write a DataFrame to CSV, preferring pyarrow's multithreaded writer.
+
+    The C++ writer streams record batches instead of materializing the full
+    string representation in memory; falls back to chunked pandas to_csv
+    when pyarrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pac
+        pac.write_csv(
+            pa.Table.from_pandas(df, preserve_index=False),
+            str(path),
+            write_options=pac.WriteOptions(batch_size=100_000),
+        )
+    except ImportError:
+        df.to_csv(path, index=False, chunksize=250_000)
+
 def build_database(scrape: bool, selenium: bool):
     """
     Builds the biogas database by fetching live data, processing it, and saving the results.
@@ -44,16 +62,27 @@ def build_database(scrape: bool, selenium: bool):
     contacts = ContactBuilder(paths["market_actors"], scrape=scrape, selenium=selenium).build()
     plants   = PlantBuilder(paths["biomass"], paths["gas_producer"], paths["locations"]).build()
 
-    merged = plants.merge(contacts, left_on="operator_id", right_on="market_actor_id", how="left")
-    merged.to_csv(OUT_JOIN_CSV, index=False)
+    # Merge only the contact columns used downstream - the join hashes the
+    # right frame, so a narrower frame means a smaller hash table and fewer
+    # bytes gathered per matched row. Contacts are one row per operator,
+    # which validate='m:1' now enforces.
+    contact_cols = [c for c in ("market_actor_id", "market_actor_name", "email", "phone", "website")
+                    if c in contacts.columns]
+    merged = plants.merge(contacts[contact_cols], left_on="operator_id",
+                          right_on="market_actor_id", how="left", validate="m:1")
+    write_csv(merged, OUT_JOIN_CSV)
     print("\n✓ Done – files ready:")
     for p in (OUT_CONTACTS_XLSX, OUT_PLANTS_CSV, OUT_JOIN_CSV):
         print("   ", p.resolve())
 
 # CLI -------------------------------------------------------------------
-if __name__ == "__main__":
+def parse_args(argv=None):
+    """Parse the pipeline CLI arguments (shared with the root wrapper)."""
     ap = argparse.ArgumentParser(description="Build German biogas DB from live MaStR")
     ap.add_argument("--scrape", action="store_true", help="crawl websites for missing email/phone")
     ap.add_argument("--selenium", action="store_true", help="enable JS fallback via headless Chrome")
-    args = ap.parse_args()
+    return ap.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
     build_database(scrape=args.scrape, selenium=args.selenium)
\ No newline at end of file
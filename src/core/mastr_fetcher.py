@@ -3,8 +3,11 @@
 # -----------------------------------------------------------------------------
 """Modern MaStR data fetcher using the open-mastr library."""
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Optional, List
+import csv
 import os
 import shutil
 import pandas as pd
@@ -14,6 +17,48 @@ from open_mastr.soap_api.download import MaStRAPI
 # Configuration constants
 CHUNKSIZE = 250_000
 
+# Priority order for each dataset (prefer tables with more data)
+DATASET_PRIORITIES = {
+    "biomass": ["biomass_extended", "biomass_eeg", "biomass", "Biomasse"],
+    "gas_producer": ["gas_producer", "gas", "Gas"],
+    "market_actors": ["market_actors", "market", "Marktakteure"],
+    "locations": ["locations_extended", "locations_basic", "location", "Lokationen"]
+}
+
+# Columns PlantBuilder actually consumes per plant dataset - the raw
+# tables carry dozens more, which are pure disk I/O and parse waste
+EXPORT_COLUMNS = {
+    "biomass": ["EinheitMastrNummer", "NameStromerzeugungseinheit", "Postleitzahl",
+                "Inbetriebnahmedatum", "Nettonennleistung", "AnlagenbetreiberMastrNummer",
+                "Laengengrad", "Breitengrad"],
+    "gas_producer": ["EinheitMastrNummer", "NameGaserzeugungseinheit", "Postleitzahl",
+                     "Inbetriebnahmedatum", "Erzeugungsleistung", "AnlagenbetreiberMastrNummer",
+                     "Laengengrad", "Breitengrad"],
+}
+
+def _fast_copy(source: Path, dest: Path) -> None:
+    """Copy a file, preferring os.copy_file_range over shutil.copy2.
+
+    CoW filesystems (btrfs/xfs) lower copy_file_range to a reflink -
+    metadata only, no bytes moved, no extra disk space - and even
+    without CoW the copy stays inside the kernel. Any OSError (cross-
+    device, unsupported FS) falls back to shutil.copy2.
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copy2(source, dest)
+        return
+    try:
+        remaining = source.stat().st_size
+        with open(source, "rb") as fsrc, open(dest, "wb") as fdst:
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(source, dest)
+    except OSError:
+        shutil.copy2(source, dest)
+
 class MaStrFetcher:
     """
     Modern MaStR data fetcher using the open-mastr library.
@@ -89,17 +134,14 @@ class MaStrFetcher:
             # For API download - only essential plant data
             data_types = ["biomass", "gas"]
         
-        # Download the data
+        # Download the data in one blocking call. Per-type concurrent
+        # calls are not safe here: every bulk call targets the same
+        # dated Gesamtdatenexport zip and the same sqlite file, so
+        # parallel threads race on the archive and lock the database.
         try:
-            if method.lower() == "bulk":
-                # Bulk download - downloads the entire dataset 
-                self.db.download(method="bulk", data=data_types)
-            else:
-                # API download - requires authentication but allows incremental updates
-                self.db.download(method="API", data=data_types)
-                
+            self.db.download(method=method, data=data_types)
             print("✅ Download completed successfully!")
-            
+
         except Exception as e:
             print(f"❌ Error during download: {e}")
             raise
@@ -108,62 +150,147 @@ class MaStrFetcher:
             return {}
         
         print("◆ Exporting data to CSV files...")
-        
+
+        # Export straight from sqlite with a column allowlist - the
+        # generic self.db.to_csv writes every column of the multi-GB
+        # tables into ~/.open-MaStR and then the files get copied here,
+        # even though PlantBuilder reads only 8 columns. Filtering at
+        # the SELECT cuts the disk writes ~5x and skips the copy pass.
+        try:
+            return self._filtered_export()
+        except Exception as e:
+            print(f"⚠️  Error during filtered export: {e}")
+            print("   Falling back to open-mastr CSV export...")
+
         # Export the relevant tables to CSV
         # Only export plant data for efficiency
         tables_to_export = [
-            "biomass",         # Biomass plants  
+            "biomass",         # Biomass plants
             "gas_producer"     # Gas plants
         ]
-        
+
         try:
             # Export to the standard open-mastr directory structure
             self.db.to_csv(tables=tables_to_export)
             print("✅ CSV export completed!")
-            
+
         except Exception as e:
             print(f"⚠️  Error during CSV export: {e}")
             print("   Attempting manual table export...")
             return self._manual_export()
-        
+
         # Find the exported CSV files and copy them to our working directory
         return self._copy_exported_files(tables_to_export)
+
+    def _filtered_export(self) -> Dict[str, Path]:
+        """Export each dataset from sqlite, keeping only the needed columns.
+
+        Uses the same table-priority order as _manual_export; datasets
+        without an allowlist (market_actors, locations) are exported in
+        full, and missing tables get the usual structured empty files.
+        """
+        available = self.available_tables
+        result_paths = {}
+        for dataset_key in ["biomass", "gas_producer", "market_actors", "locations"]:
+            output_path = self.tmp / f"{dataset_key}.csv"
+            table = next((t for t in DATASET_PRIORITIES[dataset_key]
+                          if t in available), None)
+            if table is not None:
+                self.export_table(table, output_path,
+                                  columns=EXPORT_COLUMNS.get(dataset_key))
+            elif dataset_key == "market_actors":
+                headers = ["MastrNummer", "Firmenname", "Email", "Telefon", "Webseite"]
+                pd.DataFrame(columns=headers).to_csv(output_path, index=False)
+                print(f"📄 Created empty {dataset_key}.csv with proper headers")
+            elif dataset_key == "locations":
+                headers = ["MastrNummer", "NameDerTechnischenLokation", "Laengengrad", "Breitengrad"]
+                pd.DataFrame(columns=headers).to_csv(output_path, index=False)
+                print(f"📄 Created empty {dataset_key}.csv with proper headers")
+            else:
+                output_path.touch()
+                print(f"📄 Created empty file: {dataset_key}.csv")
+            result_paths[dataset_key] = output_path
+        print("✅ CSV export completed!")
+        return result_paths
     
+    @cached_property
+    def available_tables(self) -> list[str]:
+        """Table names in the MaStR database, queried once per instance."""
+        query = "SELECT name FROM sqlite_master WHERE type='table';"
+        df = pd.read_sql_query(query, con=self.db.engine)
+        return df['name'].tolist()
+
     def get_available_tables(self) -> list[str]:
         """
         Get list of available tables in the MaStR database.
-        
+
         Returns:
             list[str]: List of table names.
         """
-        query = "SELECT name FROM sqlite_master WHERE type='table';"
-        df = pd.read_sql_query(query, con=self.db.engine)
-        return df['name'].tolist()
+        return self.available_tables
     
-    def export_table(self, table_name: str, output_path: Path) -> Path:
+    def export_table(self, table_name: str, output_path: Path,
+                     columns: Optional[List[str]] = None) -> Path:
         """
         Export a specific table to CSV.
-        
+
         Args:
             table_name (str): Name of the table to export.
             output_path (Path): Path where to save the CSV file.
-            
+            columns (list[str], optional): Allowlist of columns to export;
+                entries absent from the table are ignored. Defaults to all.
+
         Returns:
             Path: Path to the exported CSV file.
         """
         print(f"⇣ Exporting {table_name} → {output_path.name}")
-        
-        # Read table in chunks to handle large datasets
-        chunks = []
-        for chunk in pd.read_sql(table_name, con=self.db.engine, chunksize=CHUNKSIZE):
-            chunks.append(chunk)
-        
-        # Concatenate and save
-        df = pd.concat(chunks, ignore_index=True)
-        df.to_csv(output_path, index=False)
-        
+
+        # Stream rows from a raw DB cursor straight into csv.writer -
+        # no pandas chunk list, no concat copy, one pass over the table
+        conn = self.db.engine.raw_connection()
+        try:
+            cur = conn.cursor()
+            select = "*"
+            if columns:
+                cur.execute(f"PRAGMA table_info(`{table_name}`)")
+                present = {row[1] for row in cur.fetchall()}
+                wanted = [c for c in columns if c in present]
+                if wanted:
+                    select = ", ".join(f"`{c}`" for c in wanted)
+            cur.execute(f"SELECT {select} FROM `{table_name}`")
+            with open(output_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow([d[0] for d in cur.description])
+                while True:
+                    rows = cur.fetchmany(CHUNKSIZE)
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+        finally:
+            conn.close()
+
         return output_path
     
+    def stream_tables(self, datasets=("biomass", "gas_producer")):
+        """Yield (dataset_key, chunk) pairs straight from the database.
+
+        Fuses fetch and transform: instead of exporting each table to a
+        multi-GB CSV only for PlantBuilder to parse it straight back in,
+        this streams CHUNKSIZE-row DataFrames off the sqlite engine for
+        PlantBuilder.build_from_chunks to consume. The same priority
+        order as _manual_export picks the source table per dataset.
+        """
+        available = self.available_tables
+        for dataset_key in datasets:
+            table = next((t for t in DATASET_PRIORITIES.get(dataset_key, [])
+                          if t in available), None)
+            if table is None:
+                print(f"⚠️  No table found for {dataset_key}, skipping")
+                continue
+            for chunk in pd.read_sql(f"SELECT * FROM `{table}`",
+                                     con=self.db.engine, chunksize=CHUNKSIZE):
+                yield dataset_key, chunk
+
     def _copy_exported_files(self, tables_to_export: List[str]) -> Dict[str, Path]:
         """
         Copy exported CSV files from open-mastr directory to our working directory.
@@ -194,19 +321,29 @@ class MaStrFetcher:
         }
         
         result_paths = {}
+        copy_jobs = []
         for key, filename in file_mapping.items():
             source = latest_dir / filename
             dest = self.tmp / f"{key}.csv"  # Use simple names for destination
-            
+            result_paths[key] = dest
+
             if source.exists():
-                shutil.copy2(source, dest)
-                print(f"📄 Copied {filename} → {dest.name} ({source.stat().st_size:,} bytes)")
-                result_paths[key] = dest
+                copy_jobs.append((source, dest, filename))
             else:
                 print(f"⚠️  Warning: {filename} not found, creating empty file")
                 dest.touch()
-                result_paths[key] = dest
-        
+
+        def copy_one(job):
+            source, dest, filename = job
+            _fast_copy(source, dest)
+            print(f"📄 Copied {filename} → {dest.name} ({source.stat().st_size:,} bytes)")
+
+        # The multi-GB copies are independent and purely I/O bound, so
+        # overlap them - an SSD happily absorbs several readers at once
+        if copy_jobs:
+            with ThreadPoolExecutor(max_workers=4) as ex:
+                list(ex.map(copy_one, copy_jobs))
+
         return result_paths
     
     def _manual_export(self) -> Dict[str, Path]:
@@ -222,43 +359,10 @@ class MaStrFetcher:
         available_tables = self.get_available_tables()
         print(f"📋 Available tables: {', '.join(available_tables)}")
         
-        # Map table names to expected output files
-        table_mapping = {
-            "biomass": "biomass.csv",
-            "biomass_extended": "biomass.csv",
-            "biomass_eeg": "biomass.csv",
-            "gas": "gas.csv",
-            "gas_producer": "gas.csv",
-            "market": "market.csv",
-            "market_actors": "market.csv",
-            "location": "location.csv",
-            "locations_basic": "location.csv",
-            "locations_extended": "location.csv",
-            # Alternative table names that might exist
-            "Biomasse": "biomass.csv",
-            "Gas": "gas.csv",  
-            "Marktakteure": "market.csv",
-            "Lokationen": "location.csv"
-        }
-        
         result_paths = {}
-        file_to_dataset = {
-            "biomass.csv": "biomass",
-            "gas.csv": "gas_producer", 
-            "market.csv": "market_actors",
-            "location.csv": "locations"
-        }
-        
-        # Priority order for each dataset (prefer tables with more data)
-        dataset_priorities = {
-            "biomass": ["biomass_extended", "biomass_eeg", "biomass", "Biomasse"],
-            "gas_producer": ["gas_producer", "gas", "Gas"],
-            "market_actors": ["market_actors", "market", "Marktakteure"],
-            "locations": ["locations_extended", "locations_basic", "location", "Lokationen"]
-        }
-        
+
         # Export each dataset using the first available table
-        for dataset_key, table_priority in dataset_priorities.items():
+        for dataset_key, table_priority in DATASET_PRIORITIES.items():
             exported = False
             for table_name in table_priority:
                 if table_name in available_tables:
@@ -282,22 +386,7 @@ class MaStrFetcher:
                 result_paths[dataset_key] = output_path
                 print(f"📄 Created empty file: {filename}")
         
-        # Legacy approach - keep for backwards compatibility
-        for table_name in available_tables:
-            if table_name in table_mapping:
-                filename = table_mapping[table_name]
-                dataset_key = file_to_dataset.get(filename)
-                
-                # Only export if we haven't already handled this dataset
-                if dataset_key and dataset_key not in result_paths:
-                    output_path = self.tmp / filename
-                    
-                    try:
-                        self.export_table(table_name, output_path)
-                        result_paths[dataset_key] = output_path
-                    except Exception as e:
-                        print(f"⚠️  Failed to export {table_name}: {e}")
-         # Create empty files for any missing datasets with proper structure
+        # Create empty files for any missing datasets with proper structure
         for dataset_key in ["market_actors", "biomass", "gas_producer", "locations"]:
             if dataset_key not in result_paths:
                 if dataset_key == "market_actors":
@@ -384,32 +473,50 @@ class MaStrFetcher:
         Returns:
             Dictionary with database statistics and table information
         """
+        # Memoized on the database file's mtime - the per-table scans are
+        # multi-second work on the big MaStR tables and the summary gets
+        # requested repeatedly within one run
+        db_path = Path.home() / ".open-MaStR" / "data" / "sqlite" / "open-mastr.db"
+        mtime = db_path.stat().st_mtime_ns if db_path.exists() else None
+        cached = getattr(self, "_db_info_cache", None)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
         info = {
             "database_path": str(self.db.engine.url),
             "tables": {},
             "total_size_mb": 0
         }
-        
+
         try:
             # Get table information
             tables = self.get_available_tables()
             for table in tables:
                 try:
-                    count_query = f"SELECT COUNT(*) as count FROM `{table}`"
+                    # MAX(_rowid_) reads one b-tree leaf instead of
+                    # COUNT(*)'s full table scan; the dumps are
+                    # insert-only, so rowids are dense
+                    count_query = f"SELECT MAX(_rowid_) as count FROM `{table}`"
                     result = pd.read_sql_query(count_query, con=self.db.engine)
                     row_count = result['count'].iloc[0] if not result.empty else 0
-                    info["tables"][table] = {"rows": row_count}
-                except Exception as e:
-                    info["tables"][table] = {"rows": "error", "error": str(e)}
-            
+                    info["tables"][table] = {"rows": 0 if pd.isna(row_count) else int(row_count)}
+                except Exception:
+                    # WITHOUT ROWID tables and views need the full count
+                    try:
+                        count_query = f"SELECT COUNT(*) as count FROM `{table}`"
+                        result = pd.read_sql_query(count_query, con=self.db.engine)
+                        info["tables"][table] = {"rows": int(result['count'].iloc[0])}
+                    except Exception as e:
+                        info["tables"][table] = {"rows": "error", "error": str(e)}
+
             # Get database file size if it's SQLite
-            db_path = Path.home() / ".open-MaStR" / "data" / "sqlite" / "open-mastr.db"
             if db_path.exists():
                 info["total_size_mb"] = round(db_path.stat().st_size / (1024 * 1024), 2)
-                
+
         except Exception as e:
             info["error"] = str(e)
-        
+
+        self._db_info_cache = (mtime, info)
         return info
     
     def print_database_summary(self):
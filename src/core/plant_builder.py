@@ -1,14 +1,29 @@
 # ──────────────────────────────────────────────────────────────────────────────
 # FILE: biogas_db/plant_builder.py
 # -----------------------------------------------------------------------------
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict
 import pandas as pd
 from pathlib import Path
 
-# Configuration constants  
+try:
+    from config.config import PLANTS_DTYPES
+except ImportError:  # standalone execution outside the project root
+    PLANTS_DTYPES = None
+
+# Configuration constants
 CHUNKSIZE = 250_000
 OUT_PLANTS_CSV = Path("data/processed/german_biogas_plants_2025.csv")
+PLANT_COLUMNS = ["plant_id", "plant_name", "postal_code", "commissioning_year",
+                 "capacity_el_kW", "capacity_gas_m3/h", "operator_id",
+                 "latitude", "longitude", "plant_type"]
+# Compiled once - the .str.replace fallback otherwise recompiles the
+# pattern for every chunk
+_WS = re.compile(r"\s+")
 
 class PlantBuilder:
     """Merge biomass + gas units with coordinates."""
@@ -25,165 +40,371 @@ class PlantBuilder:
     
     def build(self):
         """
-        Builds a DataFrame of plant data by enriching biomass and gas CSV files with location information,
-        then saves the combined data to a CSV file.
+        Builds a DataFrame of plant data by enriching biomass and gas CSV files,
+        then saves the combined data to CSV (and Parquet when available).
+
+        The unit files carry their own coordinates (Laengengrad/Breitengrad),
+        so the locations CSV is never scanned - it holds only location ids,
+        which nothing downstream consumes.
 
         Steps:
-            1. Reads location data from a CSV file in chunks, extracting 'unit_id', 'latitude', and 'longitude'.
-            2. Creates a mapping from unit IDs to their corresponding location data.
-            3. Enriches biomass and gas data with location information using the internal _enrich method.
-            4. Concatenates the enriched DataFrames into a single DataFrame.
-            5. Saves the resulting DataFrame to a CSV file specified by OUT_PLANTS_CSV.
+            1. Enriches biomass and gas data via the internal _enrich method.
+            2. Streams the enriched chunks to OUT_PLANTS_CSV.
+
+        Returns:
+            pd.DataFrame: The combined and enriched DataFrame of plant data.
+        """
+        # The biomass and gas pipelines are independent, so run them on
+        # two threads feeding a small bounded queue (Arrow parsing and
+        # the string kernels release the GIL) while this thread drains
+        # chunks to the writers. Queue backpressure keeps the streaming
+        # memory bound intact.
+        chunk_q: queue.Queue = queue.Queue(maxsize=4)
+        _DONE = object()
+        stop = threading.Event()
+
+        def produce(src, has_el):
+            try:
+                for chunk in self._enrich(src, has_el):
+                    if stop.is_set():
+                        break
+                    chunk_q.put(chunk)
+            finally:
+                chunk_q.put(_DONE)
+
+        def drain():
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                ex.submit(produce, self.biomass_csv, True)
+                ex.submit(produce, self.gas_csv, False)
+                finished = 0
+                try:
+                    while finished < 2:
+                        chunk = chunk_q.get()
+                        if chunk is _DONE:
+                            finished += 1
+                            continue
+                        yield chunk
+                finally:
+                    # Consumer abort (writer exception or the generator
+                    # being closed): tell producers to stop and keep
+                    # draining until both sentinels arrive, so a put()
+                    # blocked on the bounded queue can complete and the
+                    # executor shutdown doesn't wait on it forever.
+                    stop.set()
+                    while finished < 2:
+                        if chunk_q.get() is _DONE:
+                            finished += 1
+
+        return self._write_stream(drain())
+
+    def build_from_chunks(self, chunk_iter):
+        """Build the plants table straight from raw DataFrame chunks.
+
+        chunk_iter yields (dataset_key, chunk) pairs - dataset_key is
+        "biomass" or "gas_producer" and chunk carries the raw MaStR
+        column names (e.g. from MastrDataFetcher.stream_tables). This
+        skips the CSV export/re-read round-trip of build(): the same
+        transform runs directly on the rows coming out of the database.
 
         Returns:
             pd.DataFrame: The combined and enriched DataFrame of plant data.
         """
-        # Create location mapping - handle actual MaStR column names
+        def transformed():
+            for dataset_key, chunk in chunk_iter:
+                if chunk.empty:
+                    continue
+                has_el = dataset_key == "biomass"
+                out = self._transform(
+                    chunk.rename(columns=self._column_mapping(has_el)), has_el)
+                if out is not None:
+                    yield out
+
+        return self._write_stream(transformed())
+
+    def _write_stream(self, chunks):
+        """Drain transformed chunks to the output files and read back.
+
+        Streams each chunk straight to the output CSV - listing the
+        chunks and concatenating needed ~2x the combined size in RAM;
+        this keeps the peak at one chunk. A snappy Parquet twin is
+        written batch-by-batch alongside: typed columns, much smaller,
+        and downstream loads skip the CSV re-parse.
+        """
         try:
-            # Try to read locations with expected columns
-            loc_chunks = []
-            location_columns = ["MastrNummer"]  # Actual MaStR location ID column
-            
-            for chunk in pd.read_csv(self.loc_csv, dtype=str, chunksize=CHUNKSIZE):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            pa = pq = None
+
+        pq_path = OUT_PLANTS_CSV.with_suffix(".parquet")
+        pq_writer = None
+        wrote_header = False
+
+        with open(OUT_PLANTS_CSV, "w", newline="") as f:
+            for chunk in chunks:
                 if chunk.empty:
                     continue
-                # For now, create empty location mapping since locations_extended is mostly empty
-                # The biomass and gas data already contain coordinates (Laengengrad, Breitengrad)
-                loc_chunks.append(chunk)
-            
-            if loc_chunks:
-                loc_df = pd.concat(loc_chunks)
-                # Create basic mapping with location IDs (though coordinates will come from unit data directly)
-                loc_map = {str(row["MastrNummer"]): {"latitude": "", "longitude": ""} 
-                          for _, row in loc_df.iterrows() if pd.notna(row.get("MastrNummer"))}
-            else:
-                loc_map = {}
-                
-        except Exception as e:
-            print(f"⚠️  Error reading location data: {e}")
-            loc_map = {}
-        
-        # Process biomass and gas data
-        biomass_dfs = list(self._enrich(self.biomass_csv, loc_map, True))
-        gas_dfs = list(self._enrich(self.gas_csv, loc_map, False))
-        
-        # Combine all data
-        all_dfs = biomass_dfs + gas_dfs
-        if all_dfs:
-            df = pd.concat(all_dfs, ignore_index=True)
-        else:
+                chunk.to_csv(f, index=False, header=not wrote_header)
+                wrote_header = True
+                if pq is not None:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if pq_writer is None:
+                        pq_writer = pq.ParquetWriter(pq_path, table.schema, compression="snappy")
+                    pq_writer.write_table(table)
+        if pq_writer is not None:
+            pq_writer.close()
+
+        if not wrote_header:
             # Create empty DataFrame with expected structure if no data
-            df = pd.DataFrame(columns=["plant_id", "plant_name", "postal_code", "commissioning_year", 
-                                     "capacity_el_kW", "capacity_gas_m3/h", "operator_id", 
-                                     "latitude", "longitude", "plant_type"])
-        
-        df.to_csv(OUT_PLANTS_CSV, index=False)
-        return df
-    
-    def _enrich(self, src: Path, loc_map: Dict[str, Dict[str, str]], has_el: bool):
+            df = pd.DataFrame(columns=PLANT_COLUMNS)
+            df.to_csv(OUT_PLANTS_CSV, index=False)
+            return df
+        # Read the typed result back for the caller's merge step -
+        # preferring the Parquet twin (mmap'd columnar decode, no parse)
+        if pq_writer is not None:
+            return pd.read_parquet(pq_path)
+        return pd.read_csv(OUT_PLANTS_CSV, dtype=PLANTS_DTYPES)
+
+    @staticmethod
+    def _read_chunks(src: Path, column_mapping: Dict[str, str]):
+        """Yield renamed chunks of src for _enrich.
+
+        With pyarrow installed the streaming reader parses only the
+        mapped columns, types the numeric ones in one pass and never
+        materializes the rest of the file; without it the chunked pandas
+        all-strings read is used.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+        except ImportError:
+            for chunk in pd.read_csv(src, dtype=str, chunksize=CHUNKSIZE):
+                yield chunk.rename(columns=column_mapping)
+            return
+
+        numeric = {"Nettonennleistung", "Erzeugungsleistung", "Laengengrad", "Breitengrad"}
+        reader = pacsv.open_csv(
+            src,
+            read_options=pacsv.ReadOptions(block_size=64 << 20),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(column_mapping),
+                include_missing_columns=True,
+                column_types={c: (pa.float64() if c in numeric else pa.string())
+                              for c in column_mapping},
+            ),
+        )
+        for batch in reader:
+            yield pa.Table.from_batches([batch]).to_pandas().rename(columns=column_mapping)
+
+    @staticmethod
+    def _clean(chunk: pd.DataFrame) -> pd.DataFrame:
+        """Standardize the id/name/postal/year string columns of a chunk.
+
+        Uses Arrow's vectorized UTF-8 kernels when pyarrow is installed -
+        the trim/replace/slice steps fuse without a pandas object column
+        materialized between each; the chained .str ops are the fallback.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            chunk["plant_id"] = chunk.unit_id.astype(str).str.replace(" ", "_").str.lower()
+            chunk["plant_name"] = chunk.plant_name.astype(str).str.strip().str.replace(_WS, " ", regex=True)
+            chunk["postal_code"] = chunk.postal_code.astype(str).str.strip().str.replace(_WS, "", regex=True)
+            # Year = first 4 chars of the date - one chained pass on a
+            # string-dtype column instead of two object-column rebuilds
+            chunk["commissioning_year"] = pd.to_numeric(
+                chunk["commissioning_year"].astype("string").str.slice(0, 4),
+                errors="coerce").fillna(0).astype("int32")
+            chunk["operator_id"] = chunk.operator_id.astype(str).str.strip().str.replace(_WS, "", regex=True)
+            return chunk
+
+        def arr(col):
+            return pa.Array.from_pandas(chunk[col].astype(str))
+
+        chunk["plant_id"] = pc.utf8_lower(pc.replace_substring(arr("unit_id"), " ", "_")).to_pandas()
+        chunk["plant_name"] = pc.replace_substring_regex(
+            pc.utf8_trim_whitespace(arr("plant_name")), r"\s+", " ").to_pandas()
+        chunk["postal_code"] = pc.replace_substring_regex(
+            pc.utf8_trim_whitespace(arr("postal_code")), r"\s+", "").to_pandas()
+        year = pc.utf8_slice_codeunits(arr("commissioning_year"), 0, 4).to_pandas()
+        chunk["commissioning_year"] = pd.to_numeric(year, errors="coerce").fillna(0).astype("int32")
+        chunk["operator_id"] = pc.replace_substring_regex(
+            pc.utf8_trim_whitespace(arr("operator_id")), r"\s+", "").to_pandas()
+        return chunk
+
+    @staticmethod
+    def _column_mapping(has_el: bool) -> Dict[str, str]:
+        """MaStR → internal column names for one source dataset."""
+        if has_el:  # Biomass data
+            return {
+                "EinheitMastrNummer": "unit_id",
+                "NameStromerzeugungseinheit": "plant_name",
+                "Postleitzahl": "postal_code",
+                "Inbetriebnahmedatum": "commissioning_year",
+                "Nettonennleistung": "capacity_el_kw",
+                "AnlagenbetreiberMastrNummer": "operator_id",
+                "Laengengrad": "longitude_raw",
+                "Breitengrad": "latitude_raw"
+            }
+        # Gas producer data
+        return {
+            "EinheitMastrNummer": "unit_id",
+            "NameGaserzeugungseinheit": "plant_name",
+            "Postleitzahl": "postal_code",
+            "Inbetriebnahmedatum": "commissioning_year",
+            "Erzeugungsleistung": "capacity_gas_m3_per_h",
+            "AnlagenbetreiberMastrNummer": "operator_id",
+            "Laengengrad": "longitude_raw",
+            "Breitengrad": "latitude_raw"
+        }
+
+    def _transform(self, chunk: pd.DataFrame, has_el: bool):
+        """Turn one renamed raw chunk into final plants rows.
+
+        Returns None when the chunk carries none of the required columns.
+        """
+        if has_el:
+            # Biomass doesn't have gas capacity
+            chunk["capacity_gas_m3_per_h"] = "0"
+        else:
+            # Gas producers don't have electrical capacity
+            chunk["capacity_el_kw"] = "0"
+
+        # Select required columns, handling missing ones
+        required_cols = ["unit_id", "plant_name", "postal_code", "commissioning_year",
+                         "capacity_el_kw", "capacity_gas_m3_per_h", "operator_id"]
+
+        available_cols = [col for col in required_cols if col in chunk.columns]
+        if not available_cols:
+            return None
+
+        # Use coordinates from the data itself if available - before the
+        # column slice drops the raw fields. float32 gives ~1 m precision
+        # over Germany's coordinate range, half the bandwidth of float64
+        if "latitude_raw" in chunk.columns and "longitude_raw" in chunk.columns:
+            latitude = pd.to_numeric(chunk["latitude_raw"], errors="coerce").astype("float32")
+            longitude = pd.to_numeric(chunk["longitude_raw"], errors="coerce").astype("float32")
+        else:
+            latitude = pd.Series(float("nan"), index=chunk.index, dtype="float32")
+            longitude = pd.Series(float("nan"), index=chunk.index, dtype="float32")
+
+        # Add missing columns with default values in one assign
+        missing = {col: "" for col in required_cols if col not in chunk.columns}
+        if missing:
+            chunk = chunk.assign(**missing)
+
+        chunk = chunk[required_cols].copy()
+        chunk["latitude"] = latitude
+        chunk["longitude"] = longitude
+
+        # Add plant type as a categorical - two distinct values across
+        # millions of rows, so store codes not strings
+        chunk["plant_type"] = pd.Categorical(
+            ["biogas" if has_el else "gas"] * len(chunk),
+            categories=["biogas", "gas"])
+
+        # Clean and transform data
+        chunk = self._clean(chunk)
+
+        chunk["capacity_el_kw"] = pd.to_numeric(chunk.capacity_el_kw, errors="coerce").fillna(0).astype("int32")
+        chunk["capacity_gas_m3_per_h"] = pd.to_numeric(chunk.capacity_gas_m3_per_h, errors="coerce").fillna(0).astype("int32")
+
+        # Reorder columns
+        chunk = chunk[["plant_id", "plant_name", "postal_code", "commissioning_year",
+                       "capacity_el_kw", "capacity_gas_m3_per_h", "operator_id",
+                       "latitude", "longitude", "plant_type"]]
+
+        # Rename columns to final format
+        return chunk.rename(columns={"capacity_el_kw": "capacity_el_kW",
+                                     "capacity_gas_m3_per_h": "capacity_gas_m3/h"})
+
+    def _enrich_polars(self, src: Path, has_el: bool):
+        """Polars lazy-scan fast path for _enrich.
+
+        The whole read → rename → clean → cast → reorder plan compiles
+        into one multi-threaded query with no pandas intermediates; the
+        result is sliced back into CHUNKSIZE pandas chunks so the
+        downstream writer contract is unchanged. Raises ImportError when
+        polars is not installed.
+        """
+        import polars as pl
+
+        mapping = self._column_mapping(has_el)
+        lf = pl.scan_csv(src, infer_schema_length=0)  # everything as strings
+        names = lf.collect_schema().names()
+        present = {raw: new for raw, new in mapping.items() if raw in names}
+        if not set(present.values()) - {"latitude_raw", "longitude_raw"}:
+            print(f"⚠️  No required columns found in {src}")
+            return
+        lf = lf.select(list(present)).rename(present)
+
+        cap_el, cap_gas = "capacity_el_kw", "capacity_gas_m3_per_h"
+        filled = [pl.lit("", dtype=pl.Utf8).alias(col)
+                  for col in mapping.values() if col not in present.values()]
+        filled.append(pl.lit("0").alias(cap_gas if has_el else cap_el))
+        lf = lf.with_columns(filled)
+
+        lf = lf.with_columns([
+            pl.col("unit_id").fill_null("").str.replace_all(" ", "_")
+                .str.to_lowercase().alias("plant_id"),
+            pl.col("plant_name").fill_null("").str.strip_chars()
+                .str.replace_all(r"\s+", " "),
+            pl.col("postal_code").fill_null("").str.strip_chars()
+                .str.replace_all(r"\s+", ""),
+            pl.col("operator_id").fill_null("").str.strip_chars()
+                .str.replace_all(r"\s+", ""),
+            pl.col("commissioning_year").str.slice(0, 4)
+                .cast(pl.Int32, strict=False).fill_null(0),
+            pl.col(cap_el).cast(pl.Float64, strict=False).fill_null(0.0)
+                .cast(pl.Int32, strict=False).fill_null(0),
+            pl.col(cap_gas).cast(pl.Float64, strict=False).fill_null(0.0)
+                .cast(pl.Int32, strict=False).fill_null(0),
+            pl.col("latitude_raw").cast(pl.Float32, strict=False).alias("latitude"),
+            pl.col("longitude_raw").cast(pl.Float32, strict=False).alias("longitude"),
+            pl.lit("biogas" if has_el else "gas").alias("plant_type"),
+        ]).select(["plant_id", "plant_name", "postal_code", "commissioning_year",
+                   cap_el, cap_gas, "operator_id", "latitude", "longitude", "plant_type"])
+
+        df = lf.collect()
+        for part in df.iter_slices(CHUNKSIZE):
+            out = part.to_pandas()
+            out["plant_type"] = pd.Categorical(out["plant_type"],
+                                               categories=["biogas", "gas"])
+            yield out.rename(columns={cap_el: "capacity_el_kW",
+                                      cap_gas: "capacity_gas_m3/h"})
+
+    def _enrich(self, src: Path, has_el: bool):
         """
         Enriches plant data from a CSV file by adding location, cleaning, and transforming columns.
 
         Args:
             src (Path): Path to the source CSV file containing plant data.
-            loc_map (Dict[str, Dict[str, str]]): Mapping from unit IDs to their latitude and longitude.
             has_el (bool): Indicates if the data includes electrical capacity ("capacity_el_kw").
 
         Yields:
             pd.DataFrame: DataFrame chunks with enriched and cleaned plant data, including location and standardized columns.
         """
         try:
-            for chunk in pd.read_csv(src, dtype=str, chunksize=CHUNKSIZE):
+            yield from self._enrich_polars(src, has_el)
+            return
+        except ImportError:
+            pass  # polars not installed - chunked Arrow/pandas path below
+        except Exception as e:
+            print(f"⚠️  Polars fast path failed for {src} ({e}); using fallback")
+
+        try:
+            for chunk in self._read_chunks(src, self._column_mapping(has_el)):
                 if chunk.empty:
                     continue
-                
-                # Map MaStR column names to our expected names
-                if has_el:  # Biomass data
-                    column_mapping = {
-                        "EinheitMastrNummer": "unit_id",
-                        "NameStromerzeugungseinheit": "plant_name", 
-                        "Postleitzahl": "postal_code",
-                        "Inbetriebnahmedatum": "commissioning_year",
-                        "Nettonennleistung": "capacity_el_kw",
-                        "AnlagenbetreiberMastrNummer": "operator_id",
-                        "Laengengrad": "longitude_raw",
-                        "Breitengrad": "latitude_raw"
-                    }
-                    # Biomass doesn't have gas capacity
-                    chunk["capacity_gas_m3_per_h"] = "0"
-                else:  # Gas producer data  
-                    column_mapping = {
-                        "EinheitMastrNummer": "unit_id",
-                        "NameGaserzeugungseinheit": "plant_name",
-                        "Postleitzahl": "postal_code", 
-                        "Inbetriebnahmedatum": "commissioning_year",
-                        "Erzeugungsleistung": "capacity_gas_m3_per_h",
-                        "AnlagenbetreiberMastrNummer": "operator_id",
-                        "Laengengrad": "longitude_raw",
-                        "Breitengrad": "latitude_raw"
-                    }
-                    # Gas producers don't have electrical capacity
-                    chunk["capacity_el_kw"] = "0"
-                
-                # Rename columns
-                chunk = chunk.rename(columns=column_mapping)
-                
-                # Select required columns, handling missing ones
-                required_cols = ["unit_id", "plant_name", "postal_code", "commissioning_year", 
-                               "capacity_el_kw", "capacity_gas_m3_per_h", "operator_id"]
-                
-                available_cols = [col for col in required_cols if col in chunk.columns]
-                if not available_cols:
+                out = self._transform(chunk, has_el)
+                if out is None:
                     print(f"⚠️  No required columns found in {src}")
                     continue
-                
-                # Add missing columns with default values
-                for col in required_cols:
-                    if col not in chunk.columns:
-                        chunk[col] = ""
-                        
-                chunk = chunk[required_cols].copy()
-                
-                # Add location data - use coordinates from the data itself if available
-                if "latitude_raw" in chunk.columns and "longitude_raw" in chunk.columns:
-                    chunk["latitude"] = pd.to_numeric(chunk["latitude_raw"], errors="coerce")
-                    chunk["longitude"] = pd.to_numeric(chunk["longitude_raw"], errors="coerce")
-                else:
-                    # Fall back to location mapping (though it's likely empty)
-                    chunk[["latitude","longitude"]] = chunk.unit_id.apply(
-                        lambda uid: pd.Series(loc_map.get(str(uid), {"latitude": None, "longitude": None}))
-                    )
-                
-                # Add plant type
-                chunk["plant_type"] = "biogas" if has_el else "gas"
-                
-                # Clean and transform data
-                chunk["plant_id"] = chunk.unit_id.astype(str).str.replace(" ", "_").str.lower()
-                chunk["plant_name"] = chunk.plant_name.astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
-                chunk["postal_code"] = chunk.postal_code.astype(str).str.strip().str.replace(r"\s+", "", regex=True)
-                
-                # Handle commissioning year - extract year from date if needed
-                chunk["commissioning_year"] = chunk["commissioning_year"].astype(str).str[:4]  # Take first 4 chars (year)
-                chunk["commissioning_year"] = pd.to_numeric(chunk.commissioning_year, errors="coerce").fillna(0).astype(int)
-                
-                chunk["capacity_el_kw"] = pd.to_numeric(chunk.capacity_el_kw, errors="coerce").fillna(0).astype(int)
-                chunk["capacity_gas_m3_per_h"] = pd.to_numeric(chunk.capacity_gas_m3_per_h, errors="coerce").fillna(0).astype(int)
-                chunk["operator_id"] = chunk.operator_id.astype(str).str.strip().str.replace(r"\s+", "", regex=True)
-                
-                # Reorder columns
-                chunk = chunk[["plant_id", "plant_name", "postal_code", "commissioning_year", 
-                              "capacity_el_kw", "capacity_gas_m3_per_h", "operator_id", 
-                              "latitude", "longitude", "plant_type"]]
-                
-                # Rename columns to final format
-                yield chunk.rename(columns={"capacity_el_kw": "capacity_el_kW",
-                                           "capacity_gas_m3_per_h": "capacity_gas_m3/h"})
-                                           
+                yield out
+
         except Exception as e:
             print(f"⚠️  Error processing {src}: {e}")
             # Return empty DataFrame with correct structure
-            empty_df = pd.DataFrame(columns=["plant_id", "plant_name", "postal_code", "commissioning_year", 
-                                           "capacity_el_kW", "capacity_gas_m3/h", "operator_id", 
-                                           "latitude", "longitude", "plant_type"])
-            yield empty_df   
+            yield pd.DataFrame(columns=PLANT_COLUMNS)
 # -----------------------------------------------------------------------------
\ No newline at end of file
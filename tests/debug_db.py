@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Debug script to check the MaStR database and export data properly."""
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from mastr_fetcher import MaStrFetcher
 import pandas as pd
 
@@ -30,27 +32,37 @@ def main():
     }
     
     result_paths = {}
-    
+
+    # Pick the first available table per dataset up front, then run the
+    # four exports in parallel - each is query + CSV write, both of
+    # which release the GIL, so wall time approaches the slowest table
+    # instead of the sum of all four
+    chosen = {}
     for dataset_key, possible_names in required_tables.items():
-        found = False
-        for table_name in possible_names:
-            if table_name in tables:
-                print(f"✅ Found table '{table_name}' for dataset '{dataset_key}'")
-                try:
-                    output_path = fetcher.tmp / f"{dataset_key}.csv"
-                    fetcher.export_table(table_name, output_path)
-                    result_paths[dataset_key] = output_path
-                    found = True
-                    break
-                except Exception as e:
-                    print(f"❌ Failed to export {table_name}: {e}")
-        
-        if not found:
+        table_name = next((n for n in possible_names if n in tables), None)
+        if table_name is None:
             print(f"⚠️  No table found for dataset '{dataset_key}'")
             # Create empty CSV with proper structure
             output_path = fetcher.tmp / f"{dataset_key}.csv"
             pd.DataFrame().to_csv(output_path, index=False)
             result_paths[dataset_key] = output_path
+        else:
+            print(f"✅ Found table '{table_name}' for dataset '{dataset_key}'")
+            chosen[dataset_key] = table_name
+
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futures = {ex.submit(fetcher.export_table, table_name,
+                             fetcher.tmp / f"{dataset_key}.csv"): dataset_key
+                   for dataset_key, table_name in chosen.items()}
+        for future in as_completed(futures):
+            dataset_key = futures[future]
+            try:
+                result_paths[dataset_key] = future.result()
+            except Exception as e:
+                print(f"❌ Failed to export {chosen[dataset_key]}: {e}")
+                output_path = fetcher.tmp / f"{dataset_key}.csv"
+                pd.DataFrame().to_csv(output_path, index=False)
+                result_paths[dataset_key] = output_path
     
     print(f"\n✅ Export complete! Files:")
     for key, path in result_paths.items():
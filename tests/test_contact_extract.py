@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Test that the hyperscan extraction returns full leftmost matches."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'core'))
+
+import contact_builder
+from contact_builder import ContactBuilder
+
+HTML = "<p>Kontakt: info@biogas-example.com, Tel. +49 30 1234567</p>"
+
+
+def main():
+    print("🧪 Testing contact extraction...")
+
+    # The regex fallback defines the expected behaviour
+    expected_email = next(iter(contact_builder.EMAIL_RE.findall(HTML)), None)
+    expected_phone = next(iter(contact_builder.PHONE_RE.findall(HTML)), None)
+    assert expected_email == "info@biogas-example.com", expected_email
+    assert expected_phone == "+49 30 1234567", expected_phone
+
+    if contact_builder._HS_DB is None:
+        print("⚠️  hyperscan not installed - only the regex fallback was checked")
+        return
+
+    # Hyperscan reports shortest matches first; the extraction must still
+    # return the full leftmost match, not a truncated prefix of it
+    email, phone = ContactBuilder._extract_hyperscan(HTML)
+    assert email == expected_email, f"{email!r} != {expected_email!r}"
+    assert phone == expected_phone, f"{phone!r} != {expected_phone!r}"
+    print("✅ hyperscan extraction matches the regex fallback")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,22 @@ import pandas as pd
 import numpy as np
 import re
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Generic titles/placeholders, bare business forms, very short names and
+# numbers-only, fused into one compiled alternation - is_generic_name is
+# the hot path of the dedup (called per name in classification and again
+# per group), and the old per-call list walk ran ~18 separate re.match scans
+_GENERIC_RE = re.compile(
+    r'(?:herr|frau|eheleute|familie|dr\.|prof\.'
+    r'|photovoltaikanlage|solaranlage|windkraftanlage|biogasanlage'
+    r'|gbr|kg|gmbh|ag|ev|e\.v\.'
+    r'|[a-z]{1,2}|\d+)$'
+)
+# Very common surnames that might be generic - only as bare surname + GbR/GmbH
+_SURNAME_RE = re.compile(
+    r'(?:müller|schmidt|schneider|fischer|weber|meyer|wagner)\s+(?:gbr|gmbh)$'
+)
 
 def is_generic_name(name):
     """
@@ -18,46 +34,34 @@ def is_generic_name(name):
     """
     if pd.isna(name) or name.strip() == '':
         return True
-    
+
     name_lower = name.lower().strip()
-    
-    # Generic titles/placeholders
-    generic_patterns = [
-        r'^herr$',
-        r'^frau$', 
-        r'^eheleute$',
-        r'^familie$',
-        r'^dr\.$',
-        r'^prof\.$',
-        r'^photovoltaikanlage$',
-        r'^solaranlage$',
-        r'^windkraftanlage$',
-        r'^biogasanlage$',
-        # Generic business forms without company name
-        r'^gbr$',
-        r'^kg$',
-        r'^gmbh$',
-        r'^ag$',
-        r'^ev$',
-        r'^e\.v\.$',
-        # Very short generic names
-        r'^[a-z]{1,2}$',
-        # Numbers only
-        r'^\d+$'
-    ]
-    
-    for pattern in generic_patterns:
-        if re.match(pattern, name_lower):
-            return True
-    
-    # Check for very common surnames that might be generic
-    common_surnames = ['müller', 'schmidt', 'schneider', 'fischer', 'weber', 'meyer', 'wagner']
-    # Only if it's just the surname + GbR/GmbH
-    for surname in common_surnames:
-        if re.match(f'^{surname}\\s+(gbr|gmbh)$', name_lower):
-            return True
-    
-    return False
+    # Every generic alternative is a short anchored token - a long name
+    # without an early space cannot match, so skip the regex entirely
+    if len(name_lower) > 32 and ' ' not in name_lower[:20]:
+        return False
+    return bool(_GENERIC_RE.match(name_lower) or _SURNAME_RE.match(name_lower))
+
+def generic_name_mask(names: pd.Series) -> pd.Series:
+    """Vectorized is_generic_name for a whole name column"""
+    low = names.astype('string').str.strip().str.lower()
+    empty = (low.isna() | (low == '')).fillna(True)
+    # Same length short-circuit as the scalar version: only short names
+    # (or long ones with an early space) go through the regex engine
+    candidate = ~empty & ~((low.str.len() > 32)
+                           & ~low.str.slice(0, 20).str.contains(' ', regex=False)
+                           ).fillna(False)
+    result = pd.Series(False, index=names.index)
+    checked = low[candidate]
+    result[candidate] = (checked.str.match(_GENERIC_RE)
+                         | checked.str.match(_SURNAME_RE)).fillna(True).astype(bool)
+    result[empty] = True
+    return result
+
+# Whitespace squeeze and legal-form standardization ('&' and 'u.' spellings
+# folded into one alternation), compiled once for the vectorized cleaning
+_WS_RE = re.compile(r'\s+')
+_GMBH_CO_KG_RE = re.compile(r'\bGmbH\s*(?:&|u\.)\s*Co\.\s*KG\b', re.IGNORECASE)
 
 def clean_operator_name(name):
     """
@@ -65,22 +69,220 @@ def clean_operator_name(name):
     """
     if pd.isna(name):
         return name
-    
+
     # Remove extra whitespace
-    cleaned = re.sub(r'\s+', ' ', str(name).strip())
-    
+    cleaned = _WS_RE.sub(' ', str(name).strip())
+
     # Standardize legal forms
-    cleaned = re.sub(r'\bGmbH\s*&\s*Co\.\s*KG\b', 'GmbH & Co. KG', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\bGmbH\s*u\.\s*Co\.\s*KG\b', 'GmbH & Co. KG', cleaned, flags=re.IGNORECASE)
-    
-    return cleaned
+    return _GMBH_CO_KG_RE.sub('GmbH & Co. KG', cleaned)
+
+def clean_operator_names(names: pd.Series) -> pd.Series:
+    """Vectorized clean_operator_name for a whole name column"""
+    return (names.astype('string').str.strip()
+            .str.replace(_WS_RE, ' ', regex=True)
+            .str.replace(_GMBH_CO_KG_RE, 'GmbH & Co. KG', regex=True))
+
+def _save_processed(df, csv_path):
+    """Write the CSV plus a compressed Parquet twin when pyarrow is present.
+
+    CSV stays the primary artifact (downstream tools and manual review
+    read it); the Parquet twin is the typed columnar copy that later
+    stages prefer to re-load.
+    """
+    df.to_csv(csv_path, index=False)
+    try:
+        df.to_parquet(csv_path[:-4] + '.parquet', compression='zstd', index=False)
+    except (ImportError, ValueError):
+        pass  # no parquet engine installed - CSV alone is still correct
+
+def _join_unique(values):
+    """Join the unique non-null values of a group ('; '-separated, for manual review)"""
+    unique = values.dropna().unique()
+    return '; '.join(unique) if len(unique) > 0 else np.nan
+
+def _consolidate_arrow(nongeneric_ops: pd.DataFrame) -> pd.DataFrame:
+    """Consolidate exact-name groups with Arrow's hash aggregation.
+
+    Table.group_by aggregates over Arrow string arrays in a SIMD swiss
+    table, without the per-element Python objects a pandas object-dtype
+    groupby manages. Output matches the pandas agg below; pandas enters
+    only at the end. Raises ImportError when pyarrow is not installed.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    cols = ['cleaned_name', 'operator_id', 'operator_name',
+            'operator_email', 'operator_phone', 'operator_website']
+    table = pa.Table.from_pandas(
+        nongeneric_ops[cols].astype({'cleaned_name': 'string'}),
+        preserve_index=False)
+
+    valid = pc.CountOptions(mode='only_valid')
+    result = table.group_by('cleaned_name').aggregate([
+        ('operator_id', 'first'),
+        ('operator_name', 'first'),
+        ('operator_email', 'distinct', valid),
+        ('operator_phone', 'distinct', valid),
+        ('operator_website', 'distinct', valid),
+        ('operator_id', 'count', pc.CountOptions(mode='all')),
+        ('operator_id', 'list'),
+    ])
+
+    def joined(list_column):
+        out = pc.binary_join(list_column, '; ').to_pandas()
+        return out.mask(out == '', np.nan)  # empty distinct list - no contact
+
+    return pd.DataFrame({
+        'operator_id': result['operator_id_first'].to_pandas(),
+        'operator_name': result['operator_name_first'].to_pandas(),
+        'operator_email': joined(result['operator_email_distinct']),
+        'operator_phone': joined(result['operator_phone_distinct']),
+        'operator_website': joined(result['operator_website_distinct']),
+        'consolidated_name': result['cleaned_name'].to_pandas(),
+        'duplicate_count': result['operator_id_count'].to_pandas(),
+        'all_ids': pc.binary_join(result['operator_id_list'], '; ').to_pandas(),
+    })
+
+_ratio_matrix_jit = None
+
+def _levenshtein_ratio_matrix(names):
+    """Normalized-Levenshtein score matrix via a numba kernel.
+
+    Fallback scorer for the fuzzy pass when rapidfuzz is unavailable.
+    Names are ASCII-folded and lowercased, then packed into one int32
+    code array with offsets; the Wagner-Fischer DP runs in nopython
+    mode with a rolling row buffer, parallelized over the first string.
+    Only the upper triangle is filled.
+    """
+    import unicodedata
+
+    from numba import njit, prange
+
+    global _ratio_matrix_jit
+    if _ratio_matrix_jit is None:
+        @njit(parallel=True, fastmath=True, cache=True)
+        def kernel(codes, offsets):
+            n = offsets.shape[0] - 1
+            out = np.zeros((n, n), np.float32)
+            for i in prange(n):
+                a0, a1 = offsets[i], offsets[i + 1]
+                la = a1 - a0
+                for j in range(i + 1, n):
+                    b0, b1 = offsets[j], offsets[j + 1]
+                    lb = b1 - b0
+                    longest = la if la > lb else lb
+                    if longest == 0:
+                        out[i, j] = 1.0
+                        continue
+                    row = np.empty(lb + 1, np.int32)
+                    for y in range(lb + 1):
+                        row[y] = y
+                    for x in range(1, la + 1):
+                        prev = row[0]  # D[x-1][y-1] for y == 1
+                        row[0] = x
+                        ca = codes[a0 + x - 1]
+                        for y in range(1, lb + 1):
+                            above = row[y]  # D[x-1][y]
+                            cost = 0 if ca == codes[b0 + y - 1] else 1
+                            best = min(min(above + 1, row[y - 1] + 1),
+                                       prev + cost)
+                            row[y] = best
+                            prev = above
+                    out[i, j] = 1.0 - row[lb] / longest
+            return out
+        _ratio_matrix_jit = kernel
+
+    folded = [unicodedata.normalize('NFKD', str(name))
+              .encode('ascii', 'ignore').lower() for name in names]
+    offsets = np.zeros(len(folded) + 1, np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in folded])
+    codes = np.frombuffer(b''.join(folded), dtype=np.uint8).astype(np.int32)
+    return _ratio_matrix_jit(codes, offsets)
+
+def _fuzzy_consolidate(nongeneric: pd.DataFrame, blocks: pd.Series) -> pd.DataFrame:
+    """Merge near-duplicate consolidated operators fuzzily.
+
+    Exact matching leaves spelling variants ("Müller Biogas GmbH" vs
+    "Mueller Biogas GmbH & Co KG") as separate rows. Names are compared
+    inside postal-code-prefix blocks (so the pairwise work stays O(n*k)
+    instead of O(n^2)), clusters are formed with a small union-find, and
+    each cluster re-aggregates like the exact pass. RapidFuzz
+    token_set_ratio >= 90 scores the pairs when installed; otherwise a
+    numba-JIT Levenshtein kernel scores them (slightly stricter - it
+    does not ignore token order). Raises ImportError when neither
+    scorer is available.
+    """
+    try:
+        from rapidfuzz import fuzz, process
+        use_rapidfuzz = True
+    except ImportError:
+        import numba  # noqa: F401 - fail here when no scorer is installed
+        use_rapidfuzz = False
+
+    n = len(nongeneric)
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[rj] = ri
+
+    names = nongeneric['consolidated_name'].astype(str).tolist()
+    positions = pd.DataFrame({'pos': np.arange(n), 'block': blocks.to_numpy()})
+    for _, grp in positions.groupby('block', sort=False):
+        pos = grp['pos'].to_numpy()
+        if len(pos) < 2:
+            continue
+        block_names = [names[p] for p in pos]
+        if use_rapidfuzz:
+            scores = process.cdist(block_names, block_names,
+                                   scorer=fuzz.token_set_ratio,
+                                   score_cutoff=90, workers=-1)
+            hits = np.argwhere(scores >= 90)
+        else:
+            hits = np.argwhere(_levenshtein_ratio_matrix(block_names) >= 0.9)
+        for i, j in hits:
+            if i < j:
+                union(pos[i], pos[j])
+
+    clusters = [find(i) for i in range(n)]
+    merged = nongeneric.assign(_cluster=clusters).groupby(
+        '_cluster', sort=False, as_index=False).agg(
+        operator_id=('operator_id', 'first'),
+        operator_name=('operator_name', 'first'),
+        operator_email=('operator_email', _join_unique),
+        operator_phone=('operator_phone', _join_unique),
+        operator_website=('operator_website', _join_unique),
+        consolidated_name=('consolidated_name', 'first'),
+        duplicate_count=('duplicate_count', 'sum'),
+        all_ids=('all_ids', lambda s: '; '.join(s.astype(str))),
+    ).drop(columns='_cluster')
+    merged['is_generic'] = False
+    return merged
 
 def deduplicate_biogas_operators():
     """
     Deduplicate only the operators that operate biogas plants
     """
     print("Loading biogas plants dataset...")
-    plants = pd.read_csv('data/processed/german_biogas_plants_enhanced.csv')
+    # Only the id/name/contact/postcode columns feed the dedup; the
+    # pyarrow engine parses them multi-threaded when installed, and the
+    # low-cardinality postcode lands as a categorical either way
+    usecols = ['plant_id', 'operator_id', 'operator_name', 'operator_email',
+               'operator_phone', 'operator_website', 'postal_code']
+    try:
+        plants = pd.read_csv('data/processed/german_biogas_plants_enhanced.csv',
+                             usecols=usecols, dtype={'postal_code': 'category'},
+                             engine='pyarrow')
+    except (ImportError, ValueError):
+        plants = pd.read_csv('data/processed/german_biogas_plants_enhanced.csv',
+                             usecols=usecols, dtype={'postal_code': 'category'})
     print(f"Biogas plants: {len(plants):,}")
     print(f"Unique plant IDs: {plants['plant_id'].nunique():,}")
     print(f"Unique operator IDs in plants: {plants['operator_id'].nunique():,}")
@@ -90,12 +292,16 @@ def deduplicate_biogas_operators():
     plant_operators = plants[['operator_id', 'operator_name', 'operator_email', 'operator_phone', 'operator_website']].drop_duplicates()
     print(f"\nUnique biogas plant operators: {len(plant_operators):,}")
     
-    # Clean operator names
+    # Clean operator names and classify generic ones - both run as
+    # vectorized .str passes over the whole column, not per-row applies
     print("Cleaning operator names...")
-    plant_operators['cleaned_name'] = plant_operators['operator_name'].apply(clean_operator_name)
-    
+    plant_operators['cleaned_name'] = clean_operator_names(plant_operators['operator_name'])
+
     # Identify generic names
-    plant_operators['is_generic'] = plant_operators['cleaned_name'].apply(is_generic_name)
+    plant_operators['is_generic'] = generic_name_mask(plant_operators['cleaned_name'])
+    # Factorize the groupby key once - grouping then hashes int32 codes
+    # rather than full strings
+    plant_operators['cleaned_name'] = plant_operators['cleaned_name'].astype('category')
     
     generic_count = plant_operators['is_generic'].sum()
     print(f"Generic/placeholder names: {generic_count:,}")
@@ -106,62 +312,64 @@ def deduplicate_biogas_operators():
     print(f"Operator names with duplicates: {len(duplicated_names):,}")
     
     print("\nTop 20 most duplicated operator names:")
+    # Reuse the classification already computed for the whole column
+    # rather than re-lowercasing and re-matching each previewed name
+    is_generic_map = dict(zip(plant_operators['cleaned_name'],
+                              plant_operators['is_generic']))
     for name, count in duplicated_names.head(20).items():
-        is_gen = is_generic_name(name)
+        is_gen = is_generic_map.get(name, False)
         print(f"  {name}: {count} occurrences {'(GENERIC)' if is_gen else ''}")
     
-    # Group by cleaned name and consolidate
+    # Group by cleaned name and consolidate - generic names pass through
+    # row-for-row, non-generic groups collapse in one vectorized agg pass
+    # instead of a Python loop with per-group dropna/join/iloc work
     print("\nConsolidating operators by name...")
-    consolidated = []
-    
-    for name, group in plant_operators.groupby('cleaned_name'):
-        if is_generic_name(name):
-            # Keep generic names separate (don't consolidate)
-            for _, row in group.iterrows():
-                consolidated.append({
-                    'operator_id': row['operator_id'],
-                    'operator_name': row['operator_name'],
-                    'operator_email': row['operator_email'],
-                    'operator_phone': row['operator_phone'],
-                    'operator_website': row['operator_website'],
-                    'consolidated_name': row['cleaned_name'],
-                    'duplicate_count': 1,
-                    'all_ids': row['operator_id'],
-                    'is_generic': True
-                })
-        else:
-            # Consolidate non-generic names
-            # Collect all contact info
-            emails = group['operator_email'].dropna().unique()
-            phones = group['operator_phone'].dropna().unique()
-            websites = group['operator_website'].dropna().unique()
-            
-            # Take best contact info
-            email = emails[0] if len(emails) > 0 else np.nan
-            phone = phones[0] if len(phones) > 0 else np.nan
-            website = websites[0] if len(websites) > 0 else np.nan
-            
-            # If multiple unique values, combine them
-            if len(emails) > 1:
-                email = '; '.join(emails)
-            if len(phones) > 1:
-                phone = '; '.join(phones)
-            if len(websites) > 1:
-                website = '; '.join(websites)
-            
-            consolidated.append({
-                'operator_id': group['operator_id'].iloc[0],  # Use first ID as master
-                'operator_name': group['operator_name'].iloc[0],  # Use first name variant
-                'operator_email': email,
-                'operator_phone': phone,
-                'operator_website': website,
-                'consolidated_name': name,
-                'duplicate_count': len(group),
-                'all_ids': '; '.join(group['operator_id'].astype(str)),
-                'is_generic': False
-            })
-    
-    consolidated_df = pd.DataFrame(consolidated)
+    generic_ops = plant_operators[plant_operators['is_generic']]
+    nongeneric_ops = plant_operators[~plant_operators['is_generic']]
+
+    try:
+        consolidated_nongeneric = _consolidate_arrow(nongeneric_ops)
+    except ImportError:
+        consolidated_nongeneric = nongeneric_ops.groupby('cleaned_name', sort=False,
+                                                         as_index=False, observed=True).agg(
+            operator_id=('operator_id', 'first'),          # Use first ID as master
+            operator_name=('operator_name', 'first'),      # Use first name variant
+            operator_email=('operator_email', _join_unique),
+            operator_phone=('operator_phone', _join_unique),
+            operator_website=('operator_website', _join_unique),
+            duplicate_count=('operator_id', 'size'),
+            all_ids=('operator_id', lambda s: '; '.join(s.astype(str))),
+        ).rename(columns={'cleaned_name': 'consolidated_name'})
+    consolidated_nongeneric['is_generic'] = False
+
+    # Keep generic names separate (don't consolidate)
+    generic_final = generic_ops[['operator_id', 'operator_name', 'operator_email',
+                                 'operator_phone', 'operator_website',
+                                 'cleaned_name']].rename(columns={'cleaned_name': 'consolidated_name'})
+    generic_final['duplicate_count'] = 1
+    generic_final['all_ids'] = generic_final['operator_id']
+    generic_final['is_generic'] = True
+
+    column_order = ['operator_id', 'operator_name', 'operator_email', 'operator_phone',
+                    'operator_website', 'consolidated_name', 'duplicate_count',
+                    'all_ids', 'is_generic']
+    consolidated_df = pd.concat([consolidated_nongeneric, generic_final],
+                                ignore_index=True)[column_order]
+
+    # Optional fuzzy pass to catch near-duplicates the exact match misses,
+    # blocked by postal-code prefix (first plant per operator)
+    try:
+        before = len(consolidated_nongeneric)
+        block_map = (plants.groupby('operator_id')['postal_code'].first()
+                     .astype(str).str[:2])
+        fuzzy_merged = _fuzzy_consolidate(
+            consolidated_nongeneric.assign(is_generic=False),
+            consolidated_nongeneric['operator_id'].map(block_map).fillna(''))
+        print(f"Fuzzy matching merged {before - len(fuzzy_merged):,} near-duplicate operators")
+        consolidated_df = pd.concat([fuzzy_merged, generic_final],
+                                    ignore_index=True)[column_order]
+    except ImportError:
+        pass  # rapidfuzz not installed - exact-match consolidation only
     
     print(f"\nConsolidation results:")
     print(f"Original operators: {len(plant_operators):,}")
@@ -181,30 +389,23 @@ def deduplicate_biogas_operators():
     
     # Save consolidated operators
     output_file = 'data/processed/biogas_operators_consolidated.csv'
-    consolidated_df.to_csv(output_file, index=False)
+    _save_processed(consolidated_df, output_file)
     print(f"\nSaved consolidated operators to: {output_file}")
     
-    # Create mapping for updating plants
-    mapping_data = []
-    for _, row in consolidated_df.iterrows():
-        if row['duplicate_count'] > 1:
-            original_ids = row['all_ids'].split('; ')
-            for original_id in original_ids:
-                mapping_data.append({
-                    'original_id': original_id,
-                    'consolidated_id': row['operator_id'],
-                    'consolidated_name': row['operator_name']
-                })
-        else:
-            mapping_data.append({
-                'original_id': row['operator_id'],
-                'consolidated_id': row['operator_id'],
-                'consolidated_name': row['operator_name']
-            })
-    
-    mapping_df = pd.DataFrame(mapping_data)
+    # Create mapping for updating plants - split + explode of the id
+    # lists runs in C instead of a Python iterrows loop building dicts;
+    # singleton rows map through on their own id
+    multi = consolidated_df[consolidated_df['duplicate_count'] > 1]
+    single = consolidated_df[consolidated_df['duplicate_count'] <= 1]
+    mapping_df = pd.concat([
+        multi.assign(original_id=multi['all_ids'].str.split('; '))
+             .explode('original_id', ignore_index=True),
+        single.assign(original_id=single['operator_id']),
+    ], ignore_index=True)[['original_id', 'operator_id', 'operator_name']].rename(
+        columns={'operator_id': 'consolidated_id',
+                 'operator_name': 'consolidated_name'})
     mapping_file = 'data/processed/biogas_operator_mapping.csv'
-    mapping_df.to_csv(mapping_file, index=False)
+    _save_processed(mapping_df, mapping_file)
     print(f"Mapping saved to: {mapping_file}")
     
     return consolidated_df, mapping_df
@@ -215,46 +416,55 @@ def update_plants_with_consolidated_operators():
     """
     print("\nUpdating plants with consolidated operators...")
     
-    plants = pd.read_csv('data/processed/german_biogas_plants_enhanced.csv')
-    mapping = pd.read_csv('data/processed/biogas_operator_mapping.csv')
-    operators = pd.read_csv('data/processed/biogas_operators_consolidated.csv')
+    plants_path = 'data/processed/german_biogas_plants_enhanced.csv'
+    mapping_path = 'data/processed/biogas_operator_mapping.csv'
+    operators_path = 'data/processed/biogas_operators_consolidated.csv'
+    dtypes = {'postal_code': 'category', 'plant_type': 'category'}
+    try:
+        import pyarrow.csv as pacsv
+        # The three loads have no dependency on each other, and Arrow's
+        # reader releases the GIL - three threads overlap I/O and parse,
+        # so the load phase costs max() of the files instead of sum()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            f_plants = executor.submit(pacsv.read_csv, plants_path)
+            f_mapping = executor.submit(pacsv.read_csv, mapping_path)
+            f_operators = executor.submit(pacsv.read_csv, operators_path)
+            plants = f_plants.result().to_pandas().astype(dtypes)
+            mapping = f_mapping.result().to_pandas()
+            operators = f_operators.result().to_pandas()
+    except ImportError:
+        plants = pd.read_csv(plants_path, dtype=dtypes)
+        mapping = pd.read_csv(mapping_path)
+        operators = pd.read_csv(operators_path)
     
     print(f"Plants: {len(plants):,}")
     print(f"Original unique operators: {plants['operator_id'].nunique():,}")
     
-    # Merge with mapping to get consolidated IDs
-    plants_mapped = plants.merge(mapping, left_on='operator_id', right_on='original_id', how='left')
-    
-    # Merge with consolidated operator details
-    plants_updated = plants_mapped.merge(
-        operators[['operator_id', 'operator_name', 'operator_email', 'operator_phone', 'operator_website']], 
-        left_on='consolidated_id', 
-        right_on='operator_id', 
-        how='left',
-        suffixes=('_old', '_new')
-    )
-    
-    # Update with consolidated information where available
-    plants_updated['operator_id'] = plants_updated['consolidated_id'].fillna(plants_updated['operator_id_old'])
-    plants_updated['operator_name'] = plants_updated['operator_name_new'].fillna(plants_updated['operator_name_old'])
-    plants_updated['operator_email'] = plants_updated['operator_email_new'].fillna(plants_updated['operator_email_old'])
-    plants_updated['operator_phone'] = plants_updated['operator_phone_new'].fillna(plants_updated['operator_phone_old'])
-    plants_updated['operator_website'] = plants_updated['operator_website_new'].fillna(plants_updated['operator_website_old'])
-    
+    # Update with consolidated information via dict/Series lookups - one
+    # O(N) map pass per column instead of two full hash joins that carry
+    # suffixed duplicate columns through a wide intermediate frame
+    id_map = dict(zip(mapping['original_id'], mapping['consolidated_id']))
+    plants['operator_id'] = plants['operator_id'].map(id_map).fillna(plants['operator_id'])
+
+    operator_details = operators.drop_duplicates('operator_id').set_index('operator_id')
+    for col in ['operator_name', 'operator_email', 'operator_phone', 'operator_website']:
+        plants[col] = plants['operator_id'].map(operator_details[col]).fillna(plants[col])
+
     # Keep only original columns
-    final_columns = ['plant_id', 'plant_name', 'postal_code', 'commissioning_year', 'capacity_el_kW', 
-                    'capacity_gas_m3/h', 'operator_id', 'latitude', 'longitude', 'plant_type', 
+    final_columns = ['plant_id', 'plant_name', 'postal_code', 'commissioning_year', 'capacity_el_kW',
+                    'capacity_gas_m3/h', 'operator_id', 'latitude', 'longitude', 'plant_type',
                     'operator_name', 'operator_email', 'operator_phone', 'operator_website']
-    plants_final = plants_updated[final_columns]
+    plants_final = plants[final_columns]
     
     print(f"Final unique operators: {plants_final['operator_id'].nunique():,}")
     print(f"Final unique operator names: {plants_final['operator_name'].nunique():,}")
     
-    # Contact coverage stats
-    has_email = plants_final['operator_email'].notna().sum()
-    has_phone = plants_final['operator_phone'].notna().sum()
-    has_website = plants_final['operator_website'].notna().sum()
-    has_any_contact = plants_final[['operator_email', 'operator_phone', 'operator_website']].notna().any(axis=1).sum()
+    # Contact coverage stats - one notna pass into a C-contiguous boolean
+    # block, reduced along both axes, instead of five full column scans
+    contact_cols = ['operator_email', 'operator_phone', 'operator_website']
+    contact_block = plants_final[contact_cols].notna().to_numpy()
+    has_email, has_phone, has_website = contact_block.sum(axis=0)
+    has_any_contact = contact_block.any(axis=1).sum()
     
     print(f"\nContact coverage:")
     print(f"Plants with email: {has_email:,} ({has_email/len(plants_final)*100:.1f}%)")
@@ -263,11 +473,12 @@ def update_plants_with_consolidated_operators():
     print(f"Plants with any contact: {has_any_contact:,} ({has_any_contact/len(plants_final)*100:.1f}%)")
     
     # Operator-level stats
-    unique_operators = plants_final.groupby('operator_id').first()
-    op_has_email = unique_operators['operator_email'].notna().sum()
-    op_has_phone = unique_operators['operator_phone'].notna().sum()
-    op_has_website = unique_operators['operator_website'].notna().sum()
-    op_has_any_contact = unique_operators[['operator_email', 'operator_phone', 'operator_website']].notna().any(axis=1).sum()
+    # One row per operator via a hash dedup - groupby().first() would
+    # sort the keys and aggregate every column just to pick row one
+    unique_operators = plants_final.drop_duplicates('operator_id', keep='first')
+    op_block = unique_operators[contact_cols].notna().to_numpy()
+    op_has_email, op_has_phone, op_has_website = op_block.sum(axis=0)
+    op_has_any_contact = op_block.any(axis=1).sum()
     
     print(f"\nOperator contact coverage:")
     print(f"Operators with email: {op_has_email:,} ({op_has_email/len(unique_operators)*100:.1f}%)")
@@ -277,7 +488,7 @@ def update_plants_with_consolidated_operators():
     
     # Save final dataset
     output_file = 'data/processed/german_biogas_plants_final.csv'
-    plants_final.to_csv(output_file, index=False)
+    _save_processed(plants_final, output_file)
     print(f"\nFinal plants dataset saved to: {output_file}")
     
     return plants_final
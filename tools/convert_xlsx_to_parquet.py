@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+One-time conversion of the operator contacts workbook to Parquet.
+
+pd.read_excel parses XML per cell via openpyxl, which dominates the
+startup time of every reporting script that touches the workbook.
+Converting each sheet once to zstd Parquet lets those scripts load a
+typed columnar file instead - run this again whenever the workbook is
+regenerated.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+XLSX_PATH = Path("german_biogas_operator_contacts.xlsx")
+OUT_DIR = Path("data/processed")
+
+
+def convert(xlsx_path: Path = XLSX_PATH, out_dir: Path = OUT_DIR) -> dict:
+    """Convert every sheet of the workbook to operator_contacts_{sheet}.parquet"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sheets = pd.read_excel(xlsx_path, sheet_name=None, dtype="string")
+
+    paths = {}
+    for name, df in sheets.items():
+        out_path = out_dir / f"operator_contacts_{name}.parquet"
+        df.to_parquet(out_path, compression="zstd", index=False)
+        print(f"• {name}: {len(df):,} rows → {out_path}")
+        paths[name] = out_path
+    return paths
+
+
+if __name__ == "__main__":
+    print("Converting operator contacts workbook to Parquet...")
+    convert()
+    print("Done.")